@@ -1,10 +1,16 @@
 # ============== IMPORTS ==============
-from tkinter import *
+from tkinter import (
+    BooleanVar, Button, Canvas, Checkbutton, DoubleVar, Frame, Label,
+    PhotoImage, TclError, Tk, DISABLED, LEFT, NORMAL,
+)
 from tkinter import messagebox, ttk
-import pandas as pd
+from collections import Counter
+import csv
+import functools
+import queue
 import random
+import threading
 from pathlib import Path
-import os
 from datetime import datetime
 
 # ============== CONSTANTS ==============
@@ -21,6 +27,10 @@ class Config:
     
     # Timing
     FLIP_DELAY = 3000  # milliseconds
+    AUTOSAVE_DELAY = 5000  # milliseconds
+    
+    # Learning
+    MISS_WEIGHT = 1.5  # weight multiplier when a word is marked "Don't Know"
     
     # Fonts
     TITLE_FONT = ("Arial", 20, "italic")
@@ -37,6 +47,32 @@ class Config:
     ORIGINAL_FILE = DATA_DIR / "urdu_words.csv"
     PROGRESS_FILE = DATA_DIR / "words_to_learn.csv"
     STATS_FILE = DATA_DIR / "learning_stats.csv"
+    LEARNED_LOG = DATA_DIR / "learned.csv"
+    
+    # I/O
+    CSV_CHUNK_SIZE = 1 << 20  # read/write buffer size in bytes
+
+
+# ============== HELPERS ==============
+_PROGRESS_TEMPLATE = "📚 Progress: {learned}/{total} words learned ({pct:.1f}%)"
+_STATS_TEMPLATE = "🎯 Session: {n} cards learned"
+
+
+def _swap_remove(items: list, index: int):
+    """Remove and return items[index] in O(1) by moving the last item into its slot"""
+    last = items.pop()
+    if index == len(items):
+        return last
+    removed = items[index]
+    items[index] = last
+    return removed
+
+
+@functools.lru_cache(maxsize=128)
+def _format_progress(learned: int, total: int) -> str:
+    """Format progress text (memoized per learned/total pair)"""
+    percentage = (learned / total * 100) if total > 0 else 0
+    return _PROGRESS_TEMPLATE.format(learned=learned, total=total, pct=percentage)
 
 
 # ============== FLASHCARD APP CLASS ==============
@@ -49,55 +85,127 @@ class FlashcardApp:
         self.window.config(padx=50, pady=50, bg=Config.BACKGROUND_COLOR)
         
         # State variables
-        self.current_card = {}
+        self._current_idx = None
+        self._cur_urdu = ""
+        self._cur_english = ""
         self.flip_timer = None
         self.cards_learned_today = 0
         self.session_start = datetime.now()
         self.is_flipped = False
         self.auto_flip_enabled = True
+        self._displayed = (None, None, None)  # (side, title, word) on canvas
+        self._pending_action = None
+        self._learned_fp = None
+        self._data_dir_ready = False
+        self._original_deck = None
+        self._dirty = False
+        self._autosave_timer = None
+        self._load_failed = False
+        
+        # Disk writes run on a background thread, in queue order
+        self._io_queue = queue.Queue()
+        self._save_generation = 0
+        self._io_thread = threading.Thread(target=self._io_worker, daemon=True)
+        self._io_thread.start()
         
         # Load data
-        self.to_learn = self._load_data()
-        self.original_count = len(self.to_learn)
+        self.urdu, self.english = self._load_data()
+        self.original_count = len(self.urdu)
+        self._start_deck()
         
         # Setup UI
         self._setup_ui()
         self._setup_keyboard_shortcuts()
         
+        # Compact progress on exit
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+        
         # Start first card
-        if self.to_learn:
+        if self.urdu:
             self.next_card()
         else:
             self._show_completion_message()
     
-    def _load_data(self) -> list:
-        """Load vocabulary data from CSV files"""
+    def _load_data(self) -> tuple:
+        """Load vocabulary data from CSV files as (urdu, english) lists"""
         try:
+            urdu, english = [], []
+            
             # Try to load progress file first
             if Config.PROGRESS_FILE.exists():
-                data = pd.read_csv(Config.PROGRESS_FILE)
-                if len(data) > 0:
-                    return data.to_dict(orient="records")
+                urdu, english = self._read_deck(Config.PROGRESS_FILE)
             
             # Fall back to original file
-            if Config.ORIGINAL_FILE.exists():
-                original_data = pd.read_csv(Config.ORIGINAL_FILE)
-                return original_data.to_dict(orient="records")
+            if not urdu:
+                urdu, english = self._load_original()
             
-            # Demo data if no files exist
-            messagebox.showwarning(
-                "Data Not Found",
-                "No vocabulary files found. Loading demo data."
-            )
-            return [
-                {"Urdu": "سلام", "English": "Hello"},
-                {"Urdu": "شکریہ", "English": "Thank you"},
-                {"Urdu": "پانی", "English": "Water"},
-            ]
+            # Drop words learned since the last compaction
+            learned = self._load_learned()
+            if learned:
+                keep = []
+                for i, card in enumerate(zip(urdu, english)):
+                    # Each log entry removes one matching card, like compaction
+                    if learned[card] > 0:
+                        learned[card] -= 1
+                    else:
+                        keep.append(i)
+                urdu = [urdu[i] for i in keep]
+                english = [english[i] for i in keep]
+            return urdu, english
             
         except Exception as e:
+            # Never write progress over files that could not be read
+            self._load_failed = True
             messagebox.showerror("Error", f"Failed to load data: {e}")
-            return []
+            return [], []
+    
+    def _load_original(self) -> tuple:
+        """Load the original deck as (urdu, english) lists, reading it only once"""
+        if self._original_deck is None:
+            urdu, english = [], []
+            if Config.ORIGINAL_FILE.exists():
+                urdu, english = self._read_deck(Config.ORIGINAL_FILE)
+            
+            if urdu:
+                self._original_deck = (urdu, english)
+            else:
+                # Demo data if no files exist
+                messagebox.showwarning(
+                    "Data Not Found",
+                    "No vocabulary files found. Loading demo data."
+                )
+                self._original_deck = (
+                    ["سلام", "شکریہ", "پانی"],
+                    ["Hello", "Thank you", "Water"],
+                )
+        
+        urdu, english = self._original_deck
+        return list(urdu), list(english)
+    
+    def _read_deck(self, path: Path) -> tuple:
+        """Read a deck CSV as (urdu, english) lists, checking its header"""
+        with open(
+            path, newline="", encoding="utf-8-sig",
+            buffering=Config.CSV_CHUNK_SIZE
+        ) as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None:
+                return [], []
+            missing = [c for c in ("Urdu", "English") if c not in reader.fieldnames]
+            if missing:
+                raise ValueError(f"{path.name} is missing column(s): {', '.join(missing)}")
+            rows = list(reader)
+        return [row["Urdu"] for row in rows], [row["English"] for row in rows]
+    
+    def _load_learned(self) -> Counter:
+        """Count the (urdu, english) cards recorded in the learned log"""
+        if not Config.LEARNED_LOG.exists():
+            return Counter()
+        with open(
+            Config.LEARNED_LOG, newline="", encoding="utf-8-sig",
+            buffering=Config.CSV_CHUNK_SIZE
+        ) as f:
+            return Counter((row[0], row[1]) for row in csv.reader(f) if len(row) >= 2)
     
     def _setup_ui(self):
         """Setup all UI components"""
@@ -181,7 +289,7 @@ class FlashcardApp:
                 image=self.cross_image,
                 bg=Config.BACKGROUND_COLOR,
                 highlightthickness=0,
-                command=self.next_card
+                command=self.dont_know
             )
             self.tick_button = Button(
                 self.button_frame,
@@ -199,7 +307,7 @@ class FlashcardApp:
                 fg="white",
                 padx=20,
                 pady=10,
-                command=self.next_card
+                command=self.dont_know
             )
             self.tick_button = Button(
                 self.button_frame,
@@ -286,49 +394,89 @@ class FlashcardApp:
         
         # Store for undo
         self.last_removed = None
+        
+        # Last values shown in the stats widgets
+        self._last_stats_key = None
+        self._stats_dirty = False
     
     def _setup_keyboard_shortcuts(self):
         """Setup keyboard bindings"""
         self.window.bind("<space>", lambda e: self.manual_flip())
-        self.window.bind("<Right>", lambda e: self.next_card())
-        self.window.bind("<Left>", lambda e: self.is_known())
+        self.window.bind("<Right>", lambda e: self._queue_action(self.dont_know))
+        self.window.bind("<Left>", lambda e: self._queue_action(self.is_known))
         self.window.bind("<r>", lambda e: self.reset_progress())
         self.window.bind("<u>", lambda e: self.undo_last())
-        self.window.bind("<Escape>", lambda e: self.window.quit())
+        self.window.bind("<Escape>", lambda e: self._on_close())
+    
+    def _queue_action(self, action):
+        """Run a navigation action on the next idle tick, keeping only the latest"""
+        scheduled = self._pending_action is not None
+        self._pending_action = action
+        if not scheduled:
+            self.window.after_idle(self._drain_pending)
+    
+    def _drain_pending(self):
+        """Run the most recently queued navigation action"""
+        action, self._pending_action = self._pending_action, None
+        if action:
+            action()
     
     def _get_progress_text(self) -> str:
         """Get progress text for display"""
         total = self.original_count
-        remaining = len(self.to_learn)
+        remaining = len(self.urdu)
         learned = total - remaining
-        percentage = (learned / total * 100) if total > 0 else 0
-        return f"📚 Progress: {learned}/{total} words learned ({percentage:.1f}%)"
+        return _format_progress(learned, total)
     
     def _update_progress_bar(self):
         """Update the progress bar"""
         if self.original_count > 0:
-            learned = self.original_count - len(self.to_learn)
+            learned = self.original_count - len(self.urdu)
             self.progress_var.set((learned / self.original_count) * 100)
     
     def _update_stats(self):
+        """Schedule a statistics refresh for the next idle tick"""
+        if self._stats_dirty:
+            return
+        self._stats_dirty = True
+        self.window.after_idle(self._flush_stats)
+    
+    def _flush_stats(self):
         """Update all statistics displays"""
+        self._stats_dirty = False
+        learned = self.original_count - len(self.urdu)
+        stats_key = (learned, self.original_count, self.cards_learned_today)
+        if stats_key == self._last_stats_key:
+            return
+        self._last_stats_key = stats_key
+        
         self.progress_label.config(text=self._get_progress_text())
         self._update_progress_bar()
         self.stats_label.config(
-            text=f"🎯 Session: {self.cards_learned_today} cards learned"
+            text=_STATS_TEMPLATE.format(n=self.cards_learned_today)
         )
     
+    def _cancel_flip(self):
+        """Cancel the pending auto-flip, if any"""
+        timer, self.flip_timer = self.flip_timer, None
+        if timer is not None:
+            try:
+                self.window.after_cancel(timer)
+            except TclError:
+                pass
+    
     def next_card(self):
         """Display the next flashcard"""
-        if self.flip_timer:
-            self.window.after_cancel(self.flip_timer)
+        self._cancel_flip()
         
-        if not self.to_learn:
+        if not self.urdu:
             self._show_completion_message()
             return
         
         self.is_flipped = False
-        self.current_card = random.choice(self.to_learn)
+        self._current_idx = self._pick_card()
+        self._cur_urdu = self.urdu[self._current_idx]
+        self._cur_english = self.english[self._current_idx]
         
         # Update card display
         self._show_front()
@@ -340,48 +488,75 @@ class FlashcardApp:
                 self.flip_card
             )
     
+    def _start_deck(self):
+        """Reset selection weights and start a fresh round"""
+        self.weights = [1.0] * len(self.urdu)
+        self._cursor = -1  # forces a shuffle on the first pick
+    
+    def _shuffle_deck(self):
+        """Reorder the deck for a new round, putting missed words at the tail"""
+        # Weighted shuffle: sort by random() ** (1 / weight), largest last
+        keys = [random.random() ** (1.0 / w) for w in self.weights]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.urdu = [self.urdu[i] for i in order]
+        self.english = [self.english[i] for i in order]
+        self.weights = [self.weights[i] for i in order]
+        self._cursor = len(self.urdu) - 1
+    
+    def _pick_card(self) -> int:
+        """Return the index of the next card in the current round"""
+        # Rounds are dealt from the tail: [0, cursor] is still unseen
+        if self._cursor < 0:
+            self._shuffle_deck()
+        index = self._cursor
+        self._cursor -= 1
+        return index
+    
+    def dont_know(self):
+        """Mark current card as not known and show the next one"""
+        if self._current_idx is not None and self.urdu:
+            self.weights[self._current_idx] *= Config.MISS_WEIGHT
+        self.next_card()
+    
     def _show_front(self):
         """Show the front of the card"""
-        if self.card_front:
-            self.canvas.itemconfig(self.card_image, image=self.card_front)
-        else:
-            self.canvas.itemconfig(self.card_image, fill="white")
-        
-        self.canvas.itemconfig(
-            self.card_title,
-            text="🇵🇰 Urdu",
-            fill=Config.TEXT_DARK
-        )
-        self.canvas.itemconfig(
-            self.card_word,
-            text=self.current_card.get("Urdu", ""),
-            fill=Config.TEXT_DARK
-        )
+        self._render_card("front", "🇵🇰 Urdu", self._cur_urdu)
     
     def flip_card(self):
         """Flip the card to show the answer"""
+        self.flip_timer = None
         self.is_flipped = True
-        
-        if self.card_back:
-            self.canvas.itemconfig(self.card_image, image=self.card_back)
-        else:
-            self.canvas.itemconfig(self.card_image, fill="#2B2B2B")
-        
-        self.canvas.itemconfig(
-            self.card_title,
-            text="🇬🇧 English",
-            fill=Config.TEXT_LIGHT
-        )
-        self.canvas.itemconfig(
-            self.card_word,
-            text=self.current_card.get("English", ""),
-            fill=Config.TEXT_LIGHT
-        )
+        self._render_card("back", "🇬🇧 English", self._cur_english)
+    
+    def _render_card(self, side: str, title: str, word: str):
+        """Draw a card side, only touching canvas items that changed"""
+        displayed = (side, title, word)
+        if displayed == self._displayed:
+            return
+        old_side, old_title, old_word = self._displayed
+        self._displayed = displayed
+        
+        side_changed = side != old_side
+        text_fill = Config.TEXT_DARK if side == "front" else Config.TEXT_LIGHT
+        
+        if side_changed:
+            image = self.card_front if side == "front" else self.card_back
+            if image:
+                self.canvas.itemconfig(self.card_image, image=image)
+            else:
+                self.canvas.itemconfig(
+                    self.card_image,
+                    fill="white" if side == "front" else "#2B2B2B"
+                )
+        
+        if side_changed or title != old_title:
+            self.canvas.itemconfig(self.card_title, text=title, fill=text_fill)
+        if side_changed or word != old_word:
+            self.canvas.itemconfig(self.card_word, text=word, fill=text_fill)
     
     def manual_flip(self):
         """Manually flip the card"""
-        if self.flip_timer:
-            self.window.after_cancel(self.flip_timer)
+        self._cancel_flip()
         
         if self.is_flipped:
             self._show_front()
@@ -392,26 +567,34 @@ class FlashcardApp:
     def _toggle_auto_flip(self):
         """Toggle auto-flip feature"""
         self.auto_flip_enabled = self.auto_flip_var.get()
-        if not self.auto_flip_enabled and self.flip_timer:
-            self.window.after_cancel(self.flip_timer)
+        if not self.auto_flip_enabled:
+            self._cancel_flip()
     
     def is_known(self):
         """Mark current card as known and remove from learning list"""
-        if not self.current_card or not self.to_learn:
+        if self._current_idx is None or not self.urdu:
             return
         
+        # Remove from lists by index (swap with last, then pop)
+        removed = (
+            _swap_remove(self.urdu, self._current_idx),
+            _swap_remove(self.english, self._current_idx),
+            _swap_remove(self.weights, self._current_idx),
+        )
+        # Only an already-seen card can fill this slot, so the unseen
+        # order in [0, cursor] is untouched
+        self._cursor = min(self._cursor, len(self.urdu) - 1)
+        
         # Store for undo
-        self.last_removed = self.current_card.copy()
+        self.last_removed = removed
         self.undo_button.config(state=NORMAL)
         
-        # Remove from list
-        if self.current_card in self.to_learn:
-            self.to_learn.remove(self.current_card)
-        
         self.cards_learned_today += 1
         
-        # Save progress
-        self._save_progress()
+        # Log progress and compact it later
+        self._log_learned(removed[0], removed[1])
+        self._dirty = True
+        self._maybe_schedule_flush()
         
         # Update display
         self._update_stats()
@@ -422,7 +605,11 @@ class FlashcardApp:
     def undo_last(self):
         """Undo the last 'known' action"""
         if self.last_removed:
-            self.to_learn.append(self.last_removed)
+            # The restored card joins the seen tail and returns next round
+            urdu, english, weight = self.last_removed
+            self.urdu.append(urdu)
+            self.english.append(english)
+            self.weights.append(weight)
             self.cards_learned_today = max(0, self.cards_learned_today - 1)
             self._save_progress()
             self._update_stats()
@@ -430,12 +617,93 @@ class FlashcardApp:
             self.undo_button.config(state=DISABLED)
             messagebox.showinfo("Undo", "Last word restored to learning list!")
     
+    def _ensure_data_dir(self):
+        """Create the data directory on first write only"""
+        if not self._data_dir_ready:
+            Config.DATA_DIR.mkdir(parents=True, exist_ok=True)
+            self._data_dir_ready = True
+    
+    def _io_worker(self):
+        """Run queued disk writes off the UI thread"""
+        while True:
+            task, payload = self._io_queue.get()
+            try:
+                if task == "stop":
+                    return
+                if task == "log":
+                    self._write_learned(*payload)
+                elif task == "save":
+                    generation, urdu, english = payload
+                    # Skip snapshots superseded by a newer save
+                    if generation == self._save_generation:
+                        self._write_progress(urdu, english)
+            finally:
+                self._io_queue.task_done()
+    
+    def _log_learned(self, urdu: str, english: str):
+        """Queue a learned word for the learned log"""
+        self._io_queue.put(("log", (urdu, english)))
+    
+    def _write_learned(self, urdu: str, english: str):
+        """Append a learned word to the learned log"""
+        try:
+            if self._learned_fp is None:
+                self._ensure_data_dir()
+                self._learned_fp = open(
+                    Config.LEARNED_LOG, "a", newline="", encoding="utf-8"
+                )
+            csv.writer(self._learned_fp).writerow([urdu, english])
+            self._learned_fp.flush()
+        except Exception as e:
+            print(f"Error logging progress: {e}")
+    
+    def _clear_learned_log(self):
+        """Close and delete the learned log"""
+        if self._learned_fp is not None:
+            self._learned_fp.close()
+            self._learned_fp = None
+        if Config.LEARNED_LOG.exists():
+            Config.LEARNED_LOG.unlink()
+    
+    def _maybe_schedule_flush(self):
+        """Schedule a single autosave if one is not already pending"""
+        if self._autosave_timer is None:
+            self._autosave_timer = self.window.after(
+                Config.AUTOSAVE_DELAY,
+                self._flush_if_dirty
+            )
+    
+    def _flush_if_dirty(self):
+        """Compact progress if anything changed since the last save"""
+        self._autosave_timer = None
+        if self._dirty:
+            self._save_progress()
+    
     def _save_progress(self):
-        """Save current progress to CSV"""
+        """Queue a snapshot of the deck to compact the learned log"""
+        self._dirty = False
+        if self._load_failed:
+            return
+        self._save_generation += 1
+        self._io_queue.put(
+            ("save", (self._save_generation, list(self.urdu), list(self.english)))
+        )
+    
+    def _write_progress(self, urdu: list, english: list):
+        """Compact the learned log into the progress CSV"""
         try:
-            Config.DATA_DIR.mkdir(parents=True, exist_ok=True)
-            df = pd.DataFrame(self.to_learn)
-            df.to_csv(Config.PROGRESS_FILE, index=False)
+            self._ensure_data_dir()
+            # Write a sibling file and rename it so a crash never truncates progress
+            tmp_file = Config.PROGRESS_FILE.with_suffix(".csv.tmp")
+            with open(
+                tmp_file, "w", newline="", encoding="utf-8",
+                buffering=Config.CSV_CHUNK_SIZE
+            ) as f:
+                writer = csv.writer(f)
+                writer.writerow(["Urdu", "English"])
+                writer.writerows(zip(urdu, english))
+            tmp_file.replace(Config.PROGRESS_FILE)
+            self._clear_learned_log()
         except Exception as e:
             print(f"Error saving progress: {e}")
     
@@ -446,16 +714,18 @@ class FlashcardApp:
             "Are you sure you want to reset all progress?\nThis cannot be undone!"
         ):
             try:
-                if Config.PROGRESS_FILE.exists():
-                    Config.PROGRESS_FILE.unlink()
-                
-                # Reload original data
-                self.to_learn = self._load_data()
-                self.original_count = len(self.to_learn)
+                # Restart from the original deck kept in memory
+                self.urdu, self.english = self._load_original()
+                self._load_failed = False
+                self.original_count = len(self.urdu)
+                self._start_deck()
                 self.cards_learned_today = 0
+                
+                # Overwrite progress and clear the learned log in the background
+                self._save_progress()
                 self._update_stats()
                 
-                if self.to_learn:
+                if self.urdu:
                     self.next_card()
                 
                 messagebox.showinfo("Reset", "Progress has been reset!")
@@ -470,6 +740,7 @@ class FlashcardApp:
         
         if self.card_front:
             self.canvas.itemconfig(self.card_image, image=self.card_front)
+        self._displayed = (None, None, None)
         
         messagebox.showinfo(
             "🎉 Congratulations!",
@@ -478,6 +749,13 @@ class FlashcardApp:
             "Click 'Reset All' to start over."
         )
     
+    def _on_close(self):
+        """Compact pending progress and close the window"""
+        self._flush_if_dirty()
+        self._io_queue.put(("stop", None))
+        self._io_thread.join()
+        self.window.destroy()
+    
     def run(self):
         """Start the application"""
         self.window.mainloop()